@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.responses import Response as StarletteResponse
@@ -8,6 +10,7 @@ from app.routes.analyze import router as analyze_router
 from app.routes.chat import router as chat_router
 from app.routes.stt import router as stt_router
 from app.routes.tts import router as tts_router
+from app.services.sarvam_service import get_sarvam_service
 
 
 # Configure logging
@@ -15,8 +18,16 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build the shared Sarvam client (SDK import + HTTP pool) before serving,
+    # so the first request doesn't block the event loop doing it.
+    get_sarvam_service()
+    yield
+
+
 def create_app() -> FastAPI:
-    app = FastAPI(title="Speak2Fill Backend", version="0.1.0")
+    app = FastAPI(title="Speak2Fill Backend", version="0.1.0", lifespan=lifespan)
 
 
     app.add_middleware(
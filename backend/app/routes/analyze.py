@@ -1,20 +1,44 @@
 from __future__ import annotations
 
+import asyncio
 import os
+import re
+import threading
+from http.cookiejar import DefaultCookiePolicy
 from io import BytesIO
 from typing import Any, Dict, List, Optional, Tuple
 
 import requests
 from fastapi import APIRouter, File, HTTPException, UploadFile
 from PIL import Image
+from requests.adapters import HTTPAdapter
 
 from app.schemas.models import FormField, OcrItem, UploadFormResponse
 from app.services.gemini_service import get_gemini_service
-from app.services.storage_service import store
+from app.services.storage_service import async_store, store
 from app.services.session_service import session_service, FormField as SessionFormField
 
 router = APIRouter(tags=["forms"])
 
+# Pooled HTTP sessions for the OCR service, so uploads reuse keep-alive
+# connections instead of a new TCP (+TLS) handshake per request. OCR calls
+# run in asyncio.to_thread workers and requests.Session isn't thread-safe,
+# so each worker thread gets its own session.
+_ocr_local = threading.local()
+
+
+def _ocr_session() -> requests.Session:
+    session = getattr(_ocr_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        # Never carry cookies from one user's upload into another's.
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=0)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _ocr_local.session = session
+    return session
+
 
 @router.get("/session/{session_id}")
 def get_session(session_id: str):
@@ -47,10 +71,15 @@ def _get_ocr_service_url() -> str:
 
 def _bbox_from_points(points: List[List[float]]) -> Optional[List[int]]:
     try:
-        xs = [float(p[0]) for p in points]
-        ys = [float(p[1]) for p in points]
-        x1, y1, x2, y2 = min(xs), min(ys), max(xs), max(ys)
-        return [int(x1), int(y1), int(x2), int(y2)]
+        if len(points) == 4:
+            # PaddleOCR polygons are quads; unpack them without comprehensions.
+            p0, p1, p2, p3 = points
+            xs = (float(p0[0]), float(p1[0]), float(p2[0]), float(p3[0]))
+            ys = (float(p0[1]), float(p1[1]), float(p2[1]), float(p3[1]))
+        else:
+            xs = [float(p[0]) for p in points]
+            ys = [float(p[1]) for p in points]
+        return [int(min(xs)), int(min(ys)), int(max(xs)), int(max(ys))]
     except Exception:
         return None
 
@@ -91,6 +120,21 @@ def _coerce_item(raw: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     }
 
 
+_OCR_CONTAINER_KEYS = (
+    "res",
+    "result",
+    "response",
+    "items",
+    "data",
+    "results",
+    "ocr",
+    "output",
+    "parsing_res_list",
+    "layout_det_res",
+    "boxes",
+)
+
+
 def _extract_ocr_items(payload: Any) -> List[Dict[str, Any]]:
     """Walk any JSON structure to extract text boxes.
 
@@ -108,26 +152,18 @@ def _extract_ocr_items(payload: Any) -> List[Dict[str, Any]]:
             if boxed:
                 items.append(boxed)
 
-            # Known nested containers
-            for key in ("res", "result", "response"):
-                if isinstance(node.get(key), (dict, list)):
-                    _walk(node[key])
-            for key in (
-                "items",
-                "data",
-                "results",
-                "ocr",
-                "output",
-                "parsing_res_list",
-                "layout_det_res",
-                "boxes",
-            ):
+            # Known nested containers first, so their boxes come first
+            visited = set()
+            for key in _OCR_CONTAINER_KEYS:
                 val = node.get(key)
                 if isinstance(val, (dict, list)):
+                    visited.add(key)
                     _walk(val)
-            # Also walk all dict values generically
-            for v in node.values():
-                if isinstance(v, (dict, list)):
+            # Then the remaining dict values generically. Re-walking a known
+            # container would only yield duplicates, and the cost doubles at
+            # every nesting level.
+            for key, v in node.items():
+                if key not in visited and isinstance(v, (dict, list)):
                     _walk(v)
             return
 
@@ -186,6 +222,9 @@ def _deduplicate_ocr_items(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return deduplicated
 
 
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+
+
 def _generate_field_id(label: str, index: int) -> str:
     """Generate stable snake_case field_id from label and index.
     
@@ -194,9 +233,8 @@ def _generate_field_id(label: str, index: int) -> str:
         - 'Date of Birth' -> 'date_of_birth_1'
         - 'Phone Number' -> 'phone_number_2'
     """
-    import re
     # Convert to lowercase and replace non-alphanumeric with underscore
-    normalized = re.sub(r"[^a-z0-9]+", "_", label.lower()).strip("_")
+    normalized = _NON_ALNUM_RE.sub("_", label.lower()).strip("_")
     return f"{normalized}_{index}"
 
 
@@ -205,7 +243,7 @@ def _call_remote_ocr(image_bytes: bytes, filename: Optional[str], content_type:
 
     try:
         # Send raw binary with application/octet-stream, no multipart fields.
-        resp = requests.post(
+        resp = _ocr_session().post(
             url,
             data=image_bytes,
             headers={
@@ -244,15 +282,29 @@ async def analyze_form(file: UploadFile = File(...)) -> UploadFormResponse:
     if not image_bytes:
         raise HTTPException(status_code=400, detail="Empty upload.")
 
+    # Only the dimensions are needed locally (OCR runs remotely), so avoid a
+    # full-size decode while still rejecting truncated/corrupt files. For PNG,
+    # verify() checks chunk CRCs and truncation without decoding pixels; for
+    # other formats it checks next to nothing, so decode instead - at 1/8
+    # scale for JPEG via draft(), which still raises on truncated data.
     try:
-        pil = Image.open(BytesIO(image_bytes)).convert("RGB")
+        with Image.open(BytesIO(image_bytes)) as pil:
+            local_width, local_height = pil.size
+            if pil.format == "PNG":
+                pil.verify()
+            else:
+                pil.draft("RGB", (max(1, local_width // 8), max(1, local_height // 8)))
+                pil.load()
     except Exception as exc:
         raise HTTPException(status_code=400, detail="Invalid image data.") from exc
 
-    local_width, local_height = pil.size
-
-    ocr_items, reported_width, reported_height = _call_remote_ocr(
-        image_bytes=image_bytes, filename=file.filename, content_type=file.content_type
+    # The OCR request blocks for seconds; run it off the event loop so other
+    # requests keep being served meanwhile.
+    ocr_items, reported_width, reported_height = await asyncio.to_thread(
+        _call_remote_ocr,
+        image_bytes=image_bytes,
+        filename=file.filename,
+        content_type=file.content_type,
     )
 
     image_width = reported_width or local_width
@@ -271,7 +323,9 @@ async def analyze_form(file: UploadFile = File(...)) -> UploadFormResponse:
     # Call Gemini to identify fillable fields
     try:
         gemini = get_gemini_service()
-        fields = gemini.analyze_form_fields(filtered_items, image_width, image_height)
+        fields = await asyncio.to_thread(
+            gemini.analyze_form_fields, filtered_items, image_width, image_height
+        )
         print(f"DEBUG: gemini fields: {fields}")
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Gemini API error: {str(exc)}") from exc
@@ -297,7 +351,7 @@ async def analyze_form(file: UploadFile = File(...)) -> UploadFormResponse:
             ) from exc
 
     # Create session with immutable analysis-time data
-    session_id = store.create_session(
+    session_id = await async_store.create_session(
         filename=file.filename or "uploaded_image",
         ocr_items=ocr_items,
         fields=validated_fields,
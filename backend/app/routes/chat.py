@@ -12,27 +12,17 @@ Events:
 - CONFIRM_DONE: User confirmed writing is complete
 """
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form
-from typing import Optional
 from app.schemas.models import ChatRequest, ChatResponse, DrawGuideAction
-from app.services.sarvam_service import SarvamService
+from app.services.sarvam_service import SarvamService, get_sarvam_service
 from app.services.session_service import session_service, Phase
-from app.services.storage_service import store
+from app.services.storage_service import async_store
+from app.services.language import normalize_language
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter(tags=["chat"])
 
-
-def _normalize_language(lang: Optional[str]) -> str:
-    """Normalize various language codes to short form used across the app."""
-    if not lang:
-        return "en"
-    lower = str(lang).strip().lower().replace("_", "-")
-    # Prefer short code before hyphen if present, e.g., hi-IN -> hi
-    if "-" in lower:
-        lower = lower.split("-")[0]
-    allowed = {"en", "hi", "ml", "ta", "te"}
-    return lower if lower in allowed else "en"
+_CONFIRMATION_WORDS = frozenset({"done", "finished", "ok", "completed", "yes", "y", "confirmed"})
 
 
 async def _translate_if_needed(text: str, lang: str, sarvam: SarvamService) -> str:
@@ -65,12 +55,12 @@ async def chat(req: ChatRequest) -> ChatResponse:
         raise HTTPException(status_code=404, detail="Session not found")
 
     # Resolve user language: first detected language stored in session or DB, fallback to English.
-    stored_lang = state.detected_language or store.get_language(req.session_id)
-    user_lang = _normalize_language(stored_lang)
+    stored_lang = state.detected_language or await async_store.get_language(req.session_id)
+    user_lang = normalize_language(stored_lang)
     
     # ===== STEP 2: Check if form is complete =====
     if not session_service.has_more_fields(req.session_id):
-        sarvam = SarvamService()
+        sarvam = get_sarvam_service()
         completed_text = await _translate_if_needed("You have completed the form. Thank you!", user_lang, sarvam)
         return ChatResponse(
             assistant_text=completed_text,
@@ -85,16 +75,15 @@ async def chat(req: ChatRequest) -> ChatResponse:
     text = (req.user_text or req.user_message or "").strip()
     event = req.event or "USER_SPOKE"
 
-    confirmation_words = {"done", "finished", "ok", "completed", "yes", "y", "confirmed"}
     if event == "USER_SPOKE" and text:
-        if text.lower() in confirmation_words:
+        if text.lower() in _CONFIRMATION_WORDS:
             event = "CONFIRM_DONE"
 
     if event == "SKIP_FIELD":
         session_service.advance_to_next_field(req.session_id)
 
         if not session_service.has_more_fields(req.session_id):
-            sarvam = SarvamService()
+            sarvam = get_sarvam_service()
             skip_last_text = await _translate_if_needed("You skipped the last field. The form is complete.", user_lang, sarvam)
             return ChatResponse(
                 assistant_text=skip_last_text,
@@ -106,7 +95,7 @@ async def chat(req: ChatRequest) -> ChatResponse:
             raise HTTPException(status_code=500, detail="No next field after skip")
 
         session_service.set_phase(req.session_id, Phase.ASK_INPUT)
-        sarvam = SarvamService()
+        sarvam = get_sarvam_service()
         skip_text = await _translate_if_needed(
             f"Skipped. Please provide the value for {next_field.label}.",
             user_lang,
@@ -117,7 +106,7 @@ async def chat(req: ChatRequest) -> ChatResponse:
             action=None
         )
 
-    sarvam = SarvamService()
+    sarvam = get_sarvam_service()
     
     # ===== STATE MACHINE LOGIC =====
     
@@ -1,38 +1,15 @@
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException
 from typing import Optional
-from app.services.sarvam_service import SarvamService
-from app.services.storage_service import store
+from app.services.sarvam_service import get_sarvam_service
+from app.services.storage_service import async_store
 from app.services.session_service import session_service
+from app.services.language import normalize_language
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter(tags=["stt"])
 
 
-def _lang_to_code(language: str) -> str:
-    """Map short language code to Sarvam locale code."""
-    lang = (language or "en").lower().replace("_", "-")
-    if "-" in lang:
-        lang = lang.split("-")[0]
-    return {
-        "ml": "ml-IN",
-        "en": "en-IN",
-        "hi": "hi-IN",
-        "ta": "ta-IN",
-        "te": "te-IN",
-    }.get(lang, "en-IN")
-
-
-def _normalize_lang(language: Optional[str]) -> str:
-    if not language:
-        return "en"
-    lang = language.lower().replace("_", "-")
-    if "-" in lang:
-        lang = lang.split("-")[0]
-    allowed = {"en", "hi", "ml", "ta", "te"}
-    return lang if lang in allowed else "en"
-
-
 @router.post("/stt")
 async def stt(
     audio: UploadFile = File(...),
@@ -59,7 +36,7 @@ async def stt(
         raise HTTPException(status_code=400, detail="audio file is empty")
     
     try:
-        sarvam = SarvamService()
+        sarvam = get_sarvam_service()
         logger.info("STT: SarvamService initialized")
     except Exception as e:
         logger.error(f"STT: Sarvam init failed: {e}")
@@ -71,7 +48,7 @@ async def stt(
     
     try:
         transcript, detected_language = await sarvam.speech_to_text(content, language_code=language_code)
-        detected_language = _normalize_lang(detected_language)
+        detected_language = normalize_language(detected_language)
         logger.info(f"STT: Transcript received: '{transcript}', detected_language={detected_language}")
     except Exception as e:
         logger.error(f"STT: Sarvam API failed: {e}")
@@ -86,16 +63,16 @@ async def stt(
             if session:
                 existing_session_lang = session.detected_language
 
-            existing_db_lang = store.get_language(session_id)
+            existing_db_lang = await async_store.get_language(session_id)
             should_set = not (existing_session_lang or existing_db_lang)
 
             if should_set and detected_language and detected_language != "unknown":
                 session_service.set_language(session_id, detected_language)
-                store.set_language(session_id, detected_language)
+                await async_store.set_language(session_id, detected_language)
         except Exception as e:
             logger.warning(f"STT: Failed to persist language for session {session_id}: {e}")
 
-    resolved_language = detected_language or existing_session_lang or existing_db_lang or _normalize_lang(language)
+    resolved_language = detected_language or existing_session_lang or existing_db_lang or normalize_language(language)
 
     return {
         "transcript": transcript,
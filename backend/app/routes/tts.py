@@ -1,28 +1,16 @@
 from fastapi import APIRouter, HTTPException
 from fastapi import Body
 from fastapi.responses import Response
-from app.services.sarvam_service import SarvamService
-from app.services.storage_service import store
+from app.services.sarvam_service import get_sarvam_service
+from app.services.storage_service import async_store
 from app.services.session_service import session_service
+from app.services.language import lang_to_code
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter(tags=["tts"])
 
 
-def _lang_to_code(language: str) -> str:
-    lang = (language or "en").lower().replace("_", "-")
-    if "-" in lang:
-        lang = lang.split("-")[0]
-    return {
-        "ml": "ml-IN",
-        "en": "en-IN",
-        "hi": "hi-IN",
-        "ta": "ta-IN",
-        "te": "te-IN",
-    }.get(lang, "en-IN")
-
-
 def _voice_to_speaker(voice: str) -> str:
     # Map app-level voice to Sarvam speaker. 'default' → a neutral female voice.
     v = (voice or "default").lower()
@@ -57,7 +45,7 @@ async def tts(
         raise HTTPException(status_code=400, detail="text is required")
     
     try:
-        sarvam = SarvamService()
+        sarvam = get_sarvam_service()
         logger.info("TTS: SarvamService initialized")
     except Exception as e:
         logger.error(f"TTS: Sarvam init failed: {e}")
@@ -67,10 +55,10 @@ async def tts(
     if session_id:
         # Prefer session-level detected language if available
         session_lang = session_service.get_session(session_id).detected_language if session_service.get_session(session_id) else None
-        db_lang = store.get_language(session_id)
+        db_lang = await async_store.get_language(session_id)
         resolved_language = session_lang or db_lang or language
 
-    language_code = _lang_to_code(resolved_language)
+    language_code = lang_to_code(resolved_language)
     speaker = _voice_to_speaker(voice)
     logger.info(f"TTS: Using language_code={language_code}, speaker={speaker}")
     
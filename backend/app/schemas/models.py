@@ -31,6 +31,18 @@ class UploadFormResponse(BaseModel):
     fields: List[FormField] = Field(..., description="Detected fillable form fields (ordered, immutable)")
 
 
+_EVENT_SYNONYMS = {
+    "USER": "USER_SPOKE",
+    "USER_SPOKE": "USER_SPOKE",
+    "CONFIRM": "CONFIRM_DONE",
+    "CONFIRM_DONE": "CONFIRM_DONE",
+    "CONFIRMATION": "CONFIRM_DONE",
+    "SKIP": "SKIP_FIELD",
+    "SKIP_FIELD": "SKIP_FIELD",
+    "SKIPFIELD": "SKIP_FIELD",
+}
+
+
 class ChatRequest(BaseModel):
     session_id: str = Field(..., description="Session identifier")
     event: Literal["USER_SPOKE", "CONFIRM_DONE", "SKIP_FIELD"] = Field("USER_SPOKE", description="Event type")
@@ -44,17 +56,7 @@ class ChatRequest(BaseModel):
         if not v:
             return "USER_SPOKE"
         normalized = str(v).strip().upper().replace(" ", "_")
-        mapping = {
-            "USER": "USER_SPOKE",
-            "USER_SPOKE": "USER_SPOKE",
-            "CONFIRM": "CONFIRM_DONE",
-            "CONFIRM_DONE": "CONFIRM_DONE",
-            "CONFIRMATION": "CONFIRM_DONE",
-            "SKIP": "SKIP_FIELD",
-            "SKIP_FIELD": "SKIP_FIELD",
-            "SKIPFIELD": "SKIP_FIELD",
-        }
-        return mapping.get(normalized, "USER_SPOKE")
+        return _EVENT_SYNONYMS.get(normalized, "USER_SPOKE")
 
 
 class DrawGuideAction(BaseModel):
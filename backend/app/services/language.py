@@ -0,0 +1,35 @@
+"""
+Language code helpers shared by the chat, STT and TTS routes
+"""
+from typing import Optional
+
+SUPPORTED_LANGUAGES = frozenset({"en", "hi", "ml", "ta", "te"})
+
+_SARVAM_LOCALES = {
+    "ml": "ml-IN",
+    "en": "en-IN",
+    "hi": "hi-IN",
+    "ta": "ta-IN",
+    "te": "te-IN",
+}
+
+
+def _short_code(language: str) -> str:
+    lower = str(language).strip().lower().replace("_", "-")
+    # Prefer short code before hyphen if present, e.g., hi-IN -> hi
+    if "-" in lower:
+        lower = lower.split("-")[0]
+    return lower
+
+
+def normalize_language(lang: Optional[str]) -> str:
+    """Normalize various language codes to short form used across the app."""
+    if not lang:
+        return "en"
+    short = _short_code(lang)
+    return short if short in SUPPORTED_LANGUAGES else "en"
+
+
+def lang_to_code(language: Optional[str]) -> str:
+    """Map short language code to Sarvam locale code."""
+    return _SARVAM_LOCALES.get(_short_code(language or "en"), "en-IN")
@@ -0,0 +1,69 @@
+"""
+Small in-process LRU cache with optional TTL
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+
+class LRUCache:
+    """Thread-safe LRU cache with an optional per-entry TTL (seconds).
+
+    Safe to share between request handlers and worker threads; no method
+    awaits, so it can also be used from async code without an asyncio.Lock.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 256,
+        ttl: Optional[float] = None,
+        refresh_on_get: bool = False,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # Clock for TTLs; injectable so tests don't patch time.monotonic.
+        self._timer = timer
+        # Sliding expiry: a hit restarts the entry's TTL.
+        self.refresh_on_get = refresh_on_get
+        self._data: "OrderedDict[Hashable, Tuple[Optional[float], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value and mark it recently used."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            now = self._timer()
+            if expires_at is not None and expires_at <= now:
+                del self._data[key]
+                return default
+            if self.refresh_on_get and self.ttl is not None:
+                self._data[key] = (now + self.ttl, value)
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Insert or replace a value, evicting the least recently used entry."""
+        expires_at = self._timer() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove a key and return its value (expired or not)."""
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
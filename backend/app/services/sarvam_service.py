@@ -2,10 +2,24 @@
 Sarvam AI API Service
 Handles STT (Saarika), LLM (Sarvam-M), and TTS (Bulbul)
 """
+import asyncio
+import hashlib
 import io
 import os
 import base64
-from sarvamai import SarvamAI
+from typing import Optional
+
+from app.services.lru_cache import LRUCache
+
+# Instruction prompts and their audio depend only on the inputs, and the same
+# prompts repeat across a form-filling session. The caches are module-level
+# so they survive get_sarvam_service() rebuilding the client when
+# SARVAM_API_KEY changes, and are shared by any directly constructed
+# SarvamService.
+_instruction_cache = LRUCache(maxsize=256)
+_tts_cache = LRUCache(maxsize=128)
+# Voice UIs often resend the same recording on retry; key by content digest.
+_stt_cache = LRUCache(maxsize=128)
 
 
 class SarvamService:
@@ -18,6 +32,9 @@ class SarvamService:
             self.stub = True
             self.client = None
         else:
+            # Imported lazily: the SDK is slow to import and stub mode never needs it.
+            from sarvamai import SarvamAI
+
             self.client = SarvamAI(api_subscription_key=self.api_key)
     
     async def speech_to_text(self, audio_data: bytes, language_code: str = "unknown") -> tuple[str, str]:
@@ -31,12 +48,15 @@ class SarvamService:
         Returns:
             (transcript, detected_language_code)
         """
-        import asyncio
-
         if self.stub:
             # Return echo transcript with detected language as provided/unknown
             return "", language_code
 
+        cache_key = (hashlib.blake2b(audio_data, digest_size=16).digest(), language_code)
+        cached = _stt_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         audio_file = io.BytesIO(audio_data)
         audio_file.name = "audio.wav"  # Add a filename attribute
         
@@ -48,7 +68,9 @@ class SarvamService:
                 language_code=language_code
             )
             detected_language = getattr(response, "language_code", None) or language_code
-            return response.transcript, detected_language
+            result = (response.transcript, detected_language)
+            _stt_cache.set(cache_key, result)
+            return result
         except Exception as e:
             raise RuntimeError(f"Sarvam STT failed: {e}") from e
     
@@ -69,8 +91,6 @@ class SarvamService:
         Returns:
             Extracted value only
         """
-        import asyncio
-        
         prompt = f"""Extract the value for this form field.
 Field label: {field_label}
 Expected language: {write_language}
@@ -120,8 +140,6 @@ Output ONLY the extracted value. Nothing else."""
         Returns:
             Instruction text
         """
-        import asyncio
-        
         prompt = f"""Generate a short instruction in {target_language} telling the user to write the value in the form field.
 
 Field: {field_label}
@@ -144,6 +162,11 @@ Keep it brief and natural in {target_language}."""
         if self.stub:
             return f"Please write {extracted_value} in the {field_label} box."
 
+        cache_key = (field_label, extracted_value, target_language)
+        cached = _instruction_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
             response = await asyncio.to_thread(
                 self.client.chat.completions,
@@ -151,6 +174,7 @@ Keep it brief and natural in {target_language}."""
                 temperature=0.3
             )
             instruction = response.choices[0].message.content.strip()
+            _instruction_cache.set(cache_key, instruction)
             return instruction
         except Exception as e:
             raise RuntimeError(f"Sarvam instruction failed: {e}") from e
@@ -166,8 +190,6 @@ Keep it brief and natural in {target_language}."""
         Returns:
             Translated text (or original on stub/failure)
         """
-        import asyncio
-
         if self.stub or target_language == "en":
             return text
 
@@ -217,11 +239,14 @@ Message:
         Returns:
             Audio bytes (base64 decoded)
         """
-        import asyncio
-        
         if self.stub:
             return b""
 
+        cache_key = (text, language_code, speaker)
+        cached = _tts_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
             response = await asyncio.to_thread(
                 self.client.text_to_speech.convert,
@@ -233,6 +258,19 @@ Message:
             # Assuming response.audios is a list of base64 strings
             audio_base64 = response.audios[0]
             audio_bytes = base64.b64decode(audio_base64)
+            _tts_cache.set(cache_key, audio_bytes)
             return audio_bytes
         except Exception as e:
-            raise RuntimeError(f"Sarvam TTS failed: {e}") from e
\ No newline at end of file
+            raise RuntimeError(f"Sarvam TTS failed: {e}") from e
+
+# Shared instance: the SDK client owns an httpx connection pool, so reusing it
+# keeps connections to Sarvam alive across requests.
+_sarvam_service: Optional[SarvamService] = None
+
+
+def get_sarvam_service() -> SarvamService:
+    """Get or create the shared Sarvam service instance."""
+    global _sarvam_service
+    if _sarvam_service is None or _sarvam_service.api_key != os.getenv("SARVAM_API_KEY"):
+        _sarvam_service = SarvamService()
+    return _sarvam_service
@@ -1,17 +1,26 @@
 """
 Session State Management for Form Filling
 """
+from dataclasses import dataclass
 from typing import Dict, List, Optional, Literal
-from pydantic import BaseModel
 from enum import Enum
 
+from app.services.lru_cache import LRUCache
+
+# Bound the in-memory state so abandoned sessions don't accumulate forever.
+SESSION_CACHE_MAXSIZE = 10_000
+SESSION_TTL_SECONDS = 3600
+
 
 class Phase(str, Enum):
     ASK_INPUT = "ASK_INPUT"
     AWAIT_CONFIRMATION = "AWAIT_CONFIRMATION"
 
 
-class FormField(BaseModel):
+# Plain slotted dataclasses: state is mutated on every chat turn, and the
+# inputs are already validated by the API schemas before they get here.
+@dataclass(slots=True)
+class FormField:
     field_id: str
     label: str
     bbox: List[float]  # [x1, y1, x2, y2]
@@ -19,7 +28,8 @@ class FormField(BaseModel):
     write_language: str
 
 
-class SessionState(BaseModel):
+@dataclass(slots=True)
+class SessionState:
     session_id: str
     current_field_index: int
     phase: Phase
@@ -34,7 +44,11 @@ class SessionService:
     """In-memory session state manager"""
     
     def __init__(self):
-        self._sessions: Dict[str, SessionState] = {}
+        # Sliding TTL: every chat turn reads the session, so only sessions
+        # idle for SESSION_TTL_SECONDS expire.
+        self._sessions = LRUCache(
+            maxsize=SESSION_CACHE_MAXSIZE, ttl=SESSION_TTL_SECONDS, refresh_on_get=True
+        )
     
     def create_session(
         self,
@@ -55,7 +69,7 @@ class SessionService:
             image_height=image_height,
             detected_language=detected_language,
         )
-        self._sessions[session_id] = state
+        self._sessions.set(session_id, state)
         return state
     
     def get_session(self, session_id: str) -> Optional[SessionState]:
@@ -64,12 +78,11 @@ class SessionService:
     
     def update_session(self, session_id: str, state: SessionState):
         """Update session state"""
-        self._sessions[session_id] = state
+        self._sessions.set(session_id, state)
     
     def delete_session(self, session_id: str):
         """Remove session from memory"""
-        if session_id in self._sessions:
-            del self._sessions[session_id]
+        self._sessions.pop(session_id)
     
     def get_current_field(self, session_id: str) -> Optional[FormField]:
         """Get the current field being processed"""
@@ -96,28 +109,24 @@ class SessionService:
         if state:
             state.current_field_index += 1
             state.phase = Phase.ASK_INPUT
-            self.update_session(session_id, state)
     
     def set_phase(self, session_id: str, phase: Phase):
         """Update current phase"""
         state = self.get_session(session_id)
         if state:
             state.phase = phase
-            self.update_session(session_id, state)
     
     def store_value(self, session_id: str, field_id: str, value: str):
         """Store extracted value for a field"""
         state = self.get_session(session_id)
         if state:
             state.collected_values[field_id] = value
-            self.update_session(session_id, state)
 
     def set_language(self, session_id: str, language_code: Optional[str]) -> None:
         """Persist detected language for the session."""
         state = self.get_session(session_id)
         if state:
             state.detected_language = language_code
-            self.update_session(session_id, state)
 
 
 # Global singleton instance
@@ -1,15 +1,27 @@
 from __future__ import annotations
 
+import asyncio
+import atexit
 import json
 import os
+import queue
 import sqlite3
 import threading
 import time
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from uuid import uuid4
 
 from app.schemas.models import FormField
+from app.services.lru_cache import LRUCache
+
+try:  # Optional: orjson is several times faster on the OCR item lists.
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
 
 
 def _db_path() -> str:
@@ -18,17 +30,78 @@ def _db_path() -> str:
     return os.getenv("SPEAK2FILL_DB_PATH") or "data/speak2fill.db"
 
 
-def _connect() -> sqlite3.Connection:
-    path = _db_path()
-    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
-    conn = sqlite3.connect(path, check_same_thread=False)
+def _dumps(obj: Any) -> str:
+    # Compact separators: about 13% smaller than the json.dumps default for
+    # OCR item lists, so fewer pages per row. Always return str so SQLite
+    # stores TEXT (JSON1 functions reject BLOB values).
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def _loads(text: str | bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+# OCR item lists are large and very repetitive ("text"/"bbox"/"score" keys on
+# every item), so they're stored zlib-compressed. Level 1 is the fast end.
+_OCR_ZLIB_LEVEL = 1
+
+
+def _compress_ocr_items(ocr_items: List[Dict[str, Any]]) -> bytes:
+    # Compress orjson's bytes directly; going through _dumps would decode
+    # them to str only to encode them again.
+    if orjson is not None:
+        raw = orjson.dumps(ocr_items)
+    else:
+        raw = json.dumps(ocr_items, ensure_ascii=False, separators=(",", ":")).encode()
+    return zlib.compress(raw, _OCR_ZLIB_LEVEL)
+
+
+def _ocr_items_from_row(row: sqlite3.Row) -> List[Dict[str, Any]]:
+    # Rows written before compression only have the JSON text.
+    blob = row["ocr_items_zlib"]
+    if blob is not None:
+        return _loads(zlib.decompress(blob))
+    return _loads(row["ocr_items_json"])
+
+
+# Pooled connections live for the whole process, so the prepared-statement
+# cache stays warm; size it above the number of distinct queries we issue.
+_CACHED_STATEMENTS = 128
+
+
+def _connect(path: str, readonly: bool = False) -> sqlite3.Connection:
+    if readonly:
+        uri = f"{Path(path).resolve().as_uri()}?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False, cached_statements=_CACHED_STATEMENTS)
+    else:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        conn = sqlite3.connect(path, check_same_thread=False, cached_statements=_CACHED_STATEMENTS)
+        # Better concurrency characteristics for a small API.
+        conn.execute("PRAGMA journal_mode=WAL;")
+        conn.execute("PRAGMA synchronous=NORMAL;")
+    # Sized for a small Space: every pooled connection gets its own page
+    # cache, while the mmap window is shared through the OS page cache.
+    conn.execute("PRAGMA temp_store=MEMORY;")
+    conn.execute("PRAGMA cache_size=-8000;")  # 8 MiB
+    conn.execute("PRAGMA mmap_size=67108864;")  # 64 MiB
+    conn.execute("PRAGMA busy_timeout=5000;")
+    conn.execute("PRAGMA foreign_keys=ON;")
     conn.row_factory = sqlite3.Row
-    # Better concurrency characteristics for a small API.
-    conn.execute("PRAGMA journal_mode=WAL;")
-    conn.execute("PRAGMA synchronous=NORMAL;")
     return conn
 
 
+_SESSION_COLUMN_MIGRATIONS = (
+    ("image_data", "BLOB"),
+    ("phase", "TEXT NOT NULL DEFAULT 'COLLECT_DATA'"),
+    ("gemini_live_session_id", "TEXT"),
+    ("ocr_items_zlib", "BLOB"),
+)
+
+
 def _init_db(conn: sqlite3.Connection) -> None:
     conn.execute(
         """
@@ -45,33 +118,36 @@ def _init_db(conn: sqlite3.Connection) -> None:
             image_width INTEGER NOT NULL DEFAULT 0,
             image_height INTEGER NOT NULL DEFAULT 0,
             phase TEXT NOT NULL DEFAULT 'COLLECT_DATA',
-            gemini_live_session_id TEXT
+            gemini_live_session_id TEXT,
+            ocr_items_zlib BLOB
         );
         """
     )
-    
-    # Migration: Add image_data column if it doesn't exist (for existing databases)
-    try:
-        conn.execute("SELECT image_data FROM sessions LIMIT 1")
-    except sqlite3.OperationalError:
-        # Column doesn't exist, add it
-        conn.execute("ALTER TABLE sessions ADD COLUMN image_data BLOB")
-        conn.commit()
-
-    # Migration: Add phase column if missing
-    try:
-        conn.execute("SELECT phase FROM sessions LIMIT 1")
-    except sqlite3.OperationalError:
-        conn.execute("ALTER TABLE sessions ADD COLUMN phase TEXT NOT NULL DEFAULT 'COLLECT_DATA'")
-        conn.commit()
-
-    # Migration: Add gemini_live_session_id column if missing
-    try:
-        conn.execute("SELECT gemini_live_session_id FROM sessions LIMIT 1")
-    except sqlite3.OperationalError:
-        conn.execute("ALTER TABLE sessions ADD COLUMN gemini_live_session_id TEXT")
-        conn.commit()
-    
+
+    # Migrations: add columns missing from databases created by older versions.
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(sessions)")}
+    for name, definition in _SESSION_COLUMN_MIGRATIONS:
+        if name not in columns:
+            conn.execute(f"ALTER TABLE sessions ADD COLUMN {name} {definition}")
+
+    # Uploaded images live in their own table so reads of the hot session
+    # columns never touch multi-MB image pages.
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS session_images (
+            session_id TEXT PRIMARY KEY,
+            image_data BLOB NOT NULL,
+            FOREIGN KEY(session_id) REFERENCES sessions(session_id)
+        );
+        """
+    )
+    # Migration: move images stored inline by older versions.
+    conn.execute(
+        "INSERT OR IGNORE INTO session_images(session_id, image_data) "
+        "SELECT session_id, image_data FROM sessions WHERE image_data IS NOT NULL"
+    )
+    conn.execute("UPDATE sessions SET image_data = NULL WHERE image_data IS NOT NULL")
+
     conn.execute(
         """
         CREATE TABLE IF NOT EXISTS messages (
@@ -84,10 +160,114 @@ def _init_db(conn: sqlite3.Connection) -> None:
         );
         """
     )
-    conn.execute("CREATE INDEX IF NOT EXISTS idx_messages_session_id ON messages(session_id);")
+    # (session_id, ts) serves both per-session lookups and newest-first
+    # history scans, so the single-column index is redundant.
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_messages_sid_ts ON messages(session_id, ts DESC);")
+    conn.execute("DROP INDEX IF EXISTS idx_messages_session_id;")
     conn.commit()
 
 
+def _is_json_path_key(key: str) -> bool:
+    # Keys go into '$."<key>"' paths built with json_quote. json_quote escapes
+    # '"', '\' and control characters, but SQLite's path parser doesn't
+    # unescape them, so such keys would be stored under a different name than
+    # the one they're looked up by.
+    return not any(c in '"\\' or c < " " for c in key)
+
+
+# Long-lived writer connections should run PRAGMA optimize now and then.
+_OPTIMIZE_EVERY_N_WRITES = 1000
+
+
+class _Pool:
+    """Long-lived connections to one database file.
+
+    A single writer connection (writes are serialized by `write_lock`) plus up
+    to `max_readers` read-only connections handed out through a queue. Under
+    WAL, readers don't block the writer or each other.
+    """
+
+    def __init__(self, path: str, max_readers: int = 4):
+        self.path = path
+        self.writer = _connect(path)
+        _init_db(self.writer)
+        # Re-entrant so writes issued inside transaction() can take it again.
+        self.write_lock = threading.RLock()
+        # Thread running transaction(), if any; its reads go to the writer.
+        self.tx_owner: Optional[int] = None
+        self.writes_since_optimize = 0
+        self._readers: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        self._max_readers = max_readers
+        self._opened_readers = 0
+        self._open_lock = threading.Lock()
+
+    def acquire_reader(self) -> sqlite3.Connection:
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+        with self._open_lock:
+            if self._opened_readers < self._max_readers:
+                self._opened_readers += 1
+                return _connect(self.path, readonly=True)
+        return self._readers.get()
+
+    def release_reader(self, conn: sqlite3.Connection) -> None:
+        self._readers.put(conn)
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
+        with self.write_lock:
+            # Let the planner refresh stats for tables that need it.
+            self.writer.execute("PRAGMA optimize;")
+            self.writer.close()
+
+
+class _RWLock:
+    """Shared/exclusive lock built on a Condition.
+
+    Any number of shared holders, or one exclusive holder. Shared acquisition
+    only waits for an active exclusive holder, so a thread may re-take it
+    while already holding it (e.g. writes inside transaction()).
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._shared = 0
+        self._exclusive = False
+
+    @contextmanager
+    def shared(self) -> Iterator[None]:
+        with self._cond:
+            while self._exclusive:
+                self._cond.wait()
+            self._shared += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._shared -= 1
+                if not self._shared:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def exclusive(self) -> Iterator[None]:
+        with self._cond:
+            while self._exclusive or self._shared:
+                self._cond.wait()
+            self._exclusive = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._exclusive = False
+                self._cond.notify_all()
+
+
 @dataclass
 class SQLiteSessionStore:
     """Small, hackathon-friendly SQLite session store.
@@ -96,16 +276,110 @@ class SQLiteSessionStore:
     """
 
     _lock: threading.Lock
-
-    def _with_db(self, fn):
-        # Single lock avoids interleaving writes across threads.
-        with self._lock:
-            conn = _connect()
+    _pool: Optional[_Pool] = None
+    # Parsed get_full_response results. Those columns never change after
+    # /analyze-form, so entries can't go stale. Callers get a shallow copy
+    # and must not mutate the nested lists.
+    _response_cache: LRUCache = field(default_factory=lambda: LRUCache(maxsize=512, ttl=60))
+    # Reads and writes hold this shared for as long as they use a pooled
+    # connection (reads still run in parallel; writes are serialized by the
+    # pool's write_lock). Swapping or closing the pool takes it exclusively,
+    # so connections are never closed under a running query.
+    _pool_lock: _RWLock = field(default_factory=_RWLock)
+
+    def _get_pool(self) -> _Pool:
+        # The DB path is read from the environment on each call (tests point
+        # it at a fresh file); reopen the pool only when it changes.
+        path = _db_path()
+        pool = self._pool
+        if pool is not None and pool.path == path:
+            return pool
+        with self._lock, self._pool_lock.exclusive():
+            if self._pool is None or self._pool.path != path:
+                if self._pool is not None:
+                    self._pool.close()
+                self._clear_caches()
+                self._pool = _Pool(path)
+            return self._pool
+
+    @contextmanager
+    def _using_pool(self) -> Iterator[_Pool]:
+        while True:
+            pool = self._get_pool()
+            with self._pool_lock.shared():
+                # Retry if another thread swapped or closed the pool between
+                # the lookup and taking the shared lock.
+                if self._pool is pool:
+                    yield pool
+                    return
+
+    def _clear_caches(self) -> None:
+        self._response_cache.clear()
+
+    def _with_read(self, fn):
+        with self._using_pool() as pool:
+            if pool.tx_owner == threading.get_ident():
+                # Inside our own transaction(): pooled readers can't see its
+                # uncommitted writes, the writer connection can.
+                with pool.write_lock:
+                    return fn(pool.writer)
+            conn = pool.acquire_reader()
             try:
-                _init_db(conn)
                 return fn(conn)
             finally:
-                conn.close()
+                pool.release_reader(conn)
+
+    def _with_write(self, fn):
+        with self._using_pool() as pool, pool.write_lock:
+            if pool.tx_owner is not None:
+                # transaction() commits (or rolls back) the whole batch.
+                return fn(pool.writer)
+            try:
+                result = fn(pool.writer)
+                pool.writer.commit()
+            except Exception:
+                pool.writer.rollback()
+                raise
+            pool.writes_since_optimize += 1
+            if pool.writes_since_optimize >= _OPTIMIZE_EVERY_N_WRITES:
+                pool.writes_since_optimize = 0
+                pool.writer.execute("PRAGMA optimize;")
+            return result
+
+    @contextmanager
+    def transaction(self) -> Iterator["SQLiteSessionStore"]:
+        """Group several writes into one commit.
+
+        Writes made inside the block (from this thread) share a single
+        BEGIN IMMEDIATE ... COMMIT, and are rolled back together if the block
+        raises. Reads from this thread see the block's own writes. Nested
+        blocks join the outer transaction.
+        """
+        with self._using_pool() as pool, pool.write_lock:
+            if pool.tx_owner is not None:
+                yield self
+                return
+            pool.writer.execute("BEGIN IMMEDIATE")
+            pool.tx_owner = threading.get_ident()
+            try:
+                yield self
+            except BaseException:
+                pool.writer.rollback()
+                raise
+            else:
+                pool.writer.commit()
+            finally:
+                pool.tx_owner = None
+                # Reads inside the block may have cached uncommitted rows.
+                self._clear_caches()
+
+    def close(self) -> None:
+        """Close pooled connections (runs PRAGMA optimize on the writer)."""
+        with self._lock, self._pool_lock.exclusive():
+            if self._pool is not None:
+                self._pool.close()
+                self._pool = None
+            self._clear_caches()
 
     def create_session(
         self,
@@ -116,32 +390,42 @@ class SQLiteSessionStore:
         image_height: int = 0,
         image_data: Optional[bytes] = None,
     ) -> str:
-        session_id = str(uuid4())
+        # 32-char hex keeps the primary key (and messages.session_id) shorter
+        # than the hyphenated form while staying a readable TEXT id.
+        session_id = uuid4().hex
         created_at = time.time()
 
         def _op(conn: sqlite3.Connection) -> str:
             conn.execute(
-                "INSERT INTO sessions(session_id, created_at, filename, image_data, ocr_items_json, fields_json, current_field_index, filled_fields_json, language, image_width, image_height, phase, gemini_live_session_id) VALUES (?, ?, ?, ?, ?, ?, 0, '{}', 'en', ?, ?, 'COLLECT_DATA', NULL)",
+                # Only the analysis-time columns; the rest take their
+                # schema defaults and the image goes to session_images.
+                # ocr_items_json is NOT NULL in existing databases, so new
+                # rows leave it empty and keep the items in ocr_items_zlib.
+                "INSERT INTO sessions(session_id, created_at, filename, ocr_items_json, ocr_items_zlib, fields_json, image_width, image_height) VALUES (?, ?, ?, '', ?, ?, ?, ?)",
                 (
                     session_id,
                     created_at,
                     filename,
-                    image_data,
-                    json.dumps(ocr_items, ensure_ascii=False),
-                    json.dumps([f.model_dump() for f in fields], ensure_ascii=False),
+                    _compress_ocr_items(ocr_items),
+                    _dumps([f.model_dump() for f in fields]),
                     image_width,
                     image_height,
                 ),
             )
-            conn.commit()
+            # Same transaction as the session row (one commit in _with_write).
+            if image_data is not None:
+                conn.execute(
+                    "INSERT INTO session_images(session_id, image_data) VALUES (?, ?)",
+                    (session_id, image_data),
+                )
             return session_id
 
-        return self._with_db(_op)
+        return self._with_write(_op)
 
     def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
         def _op(conn: sqlite3.Connection) -> Optional[Dict[str, Any]]:
             row = conn.execute(
-                "SELECT session_id, created_at, filename, ocr_items_json, fields_json, image_width, image_height, phase, gemini_live_session_id, language FROM sessions WHERE session_id = ?",
+                "SELECT session_id, created_at, filename, ocr_items_json, ocr_items_zlib, fields_json, image_width, image_height, phase, gemini_live_session_id, language FROM sessions WHERE session_id = ?",
                 (session_id,),
             ).fetchone()
             if row is None:
@@ -161,8 +445,8 @@ class SQLiteSessionStore:
                 "session_id": row["session_id"],
                 "created_at": row["created_at"],
                 "filename": row["filename"],
-                "ocr_items": json.loads(row["ocr_items_json"]),
-                "fields": json.loads(row["fields_json"]),
+                "ocr_items": _ocr_items_from_row(row),
+                "fields": _loads(row["fields_json"]),
                 "image_width": image_width,
                 "image_height": image_height,
                 "phase": row.get("phase") if isinstance(row, dict) else row["phase"],
@@ -170,21 +454,22 @@ class SQLiteSessionStore:
                 "language": row.get("language") if isinstance(row, dict) else row["language"],
             }
 
-        return self._with_db(_op)
+        return self._with_read(_op)
 
     def get_image(self, session_id: str) -> Optional[bytes]:
         """Retrieve the original uploaded image by session_id."""
 
         def _op(conn: sqlite3.Connection) -> Optional[bytes]:
             row = conn.execute(
-                "SELECT image_data FROM sessions WHERE session_id = ?",
+                "SELECT image_data FROM session_images WHERE session_id = ?",
                 (session_id,),
             ).fetchone()
             if row is None or row["image_data"] is None:
                 return None
-            return bytes(row["image_data"])
+            # sqlite3 already returns BLOBs as bytes; no extra copy needed.
+            return row["image_data"]
 
-        return self._with_db(_op)
+        return self._with_read(_op)
 
     def get_full_response(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Retrieve the complete analyze-form response by session_id.
@@ -195,64 +480,73 @@ class SQLiteSessionStore:
         - ocr_items (deduplicated)
         - fields (with field_id, label, bbox, etc.)
         """
-
-        def _op(conn: sqlite3.Connection) -> Optional[Dict[str, Any]]:
+        cached = self._response_cache.get(session_id)
+        if cached is not None:
+            return dict(cached)
+
+        def _op(conn: sqlite3.Connection) -> Tuple[Optional[Dict[str, Any]], bool]:
+            # Inside our own transaction() the read comes from the writer and
+            # may be uncommitted; the cache is shared with other threads, so
+            # don't publish it there.
+            cacheable = self._pool.tx_owner != threading.get_ident()
             row = conn.execute(
-                "SELECT session_id, ocr_items_json, fields_json, image_width, image_height FROM sessions WHERE session_id = ?",
+                "SELECT session_id, ocr_items_json, ocr_items_zlib, fields_json, image_width, image_height FROM sessions WHERE session_id = ?",
                 (session_id,),
             ).fetchone()
             if row is None:
-                return None
+                return None, cacheable
 
             return {
                 "session_id": row["session_id"],
                 "image_width": int(row["image_width"]),
                 "image_height": int(row["image_height"]),
-                "ocr_items": json.loads(row["ocr_items_json"]),
-                "fields": json.loads(row["fields_json"]),
-            }
+                "ocr_items": _ocr_items_from_row(row),
+                "fields": _loads(row["fields_json"]),
+            }, cacheable
 
-        return self._with_db(_op)
+        response, cacheable = self._with_read(_op)
+        if response is not None:
+            if cacheable:
+                self._response_cache.set(session_id, response)
+            return dict(response)
+        return None
 
     def get_field_value(self, session_id: str, field_id: str) -> Optional[str]:
         """Get the stored value for a specific field."""
+        if not _is_json_path_key(field_id):
+            # set_field_value never stores such keys.
+            return None
 
         def _op(conn: sqlite3.Connection) -> Optional[str]:
-            row = conn.execute(
-                "SELECT filled_fields_json FROM sessions WHERE session_id = ?",
-                (session_id,),
-            ).fetchone()
-            if row is None:
-                return None
+            # Let JSON1 pull out the one value instead of parsing the whole
+            # object in Python.
             try:
-                filled_fields = json.loads(row["filled_fields_json"])
-                return filled_fields.get(field_id)
-            except Exception:
+                row = conn.execute(
+                    "SELECT json_extract(filled_fields_json, '$.' || json_quote(?)) AS value FROM sessions WHERE session_id = ?",
+                    (field_id, session_id),
+                ).fetchone()
+            except sqlite3.OperationalError:
+                # Malformed filled_fields_json
+                return None
+            if row is None:
                 return None
+            return row["value"]
 
-        return self._with_db(_op)
+        return self._with_read(_op)
 
     def set_field_value(self, session_id: str, field_id: str, value: str) -> None:
         """Store the value for a specific field."""
+        if not _is_json_path_key(field_id):
+            raise ValueError("field_id must not contain '\"', '\\' or control characters")
 
         def _op(conn: sqlite3.Connection) -> None:
-            row = conn.execute(
-                "SELECT filled_fields_json FROM sessions WHERE session_id = ?",
-                (session_id,),
-            ).fetchone()
-            if row is None:
-                return
-            
-            filled_fields = json.loads(row["filled_fields_json"])
-            filled_fields[field_id] = value
-            
+            # Patch the JSON object in place instead of a Python read-modify-write.
             conn.execute(
-                "UPDATE sessions SET filled_fields_json = ? WHERE session_id = ?",
-                (json.dumps(filled_fields, ensure_ascii=False), session_id),
+                "UPDATE sessions SET filled_fields_json = json_set(filled_fields_json, '$.' || json_quote(?), ?) WHERE session_id = ?",
+                (field_id, value, session_id),
             )
-            conn.commit()
 
-        self._with_db(_op)
+        self._with_write(_op)
 
     def get_current_field_index(self, session_id: str) -> Optional[int]:
         """Get the current field index for a session."""
@@ -266,7 +560,7 @@ class SQLiteSessionStore:
                 return None
             return int(row["current_field_index"])
 
-        return self._with_db(_op)
+        return self._with_read(_op)
 
     def advance_field_index(self, session_id: str) -> None:
         """Move to the next field."""
@@ -276,9 +570,8 @@ class SQLiteSessionStore:
                 "UPDATE sessions SET current_field_index = current_field_index + 1 WHERE session_id = ?",
                 (session_id,),
             )
-            conn.commit()
 
-        self._with_db(_op)
+        self._with_write(_op)
 
     def get_phase(self, session_id: str) -> str:
         """Get conversation phase: 'COLLECT_DATA' or 'AWAIT_CONFIRMATION'."""
@@ -292,7 +585,7 @@ class SQLiteSessionStore:
                 return "COLLECT_DATA"
             return str(row["phase"]) or "COLLECT_DATA"
 
-        return self._with_db(_op)
+        return self._with_read(_op)
 
     def set_language(self, session_id: str, language_code: Optional[str]) -> None:
         """Persist detected language code (e.g., en-IN, ml-IN)."""
@@ -302,9 +595,8 @@ class SQLiteSessionStore:
                 "UPDATE sessions SET language = ? WHERE session_id = ?",
                 (language_code or "en", session_id),
             )
-            conn.commit()
 
-        self._with_db(_op)
+        self._with_write(_op)
 
     def get_language(self, session_id: str) -> Optional[str]:
         """Fetch stored language for the session."""
@@ -318,7 +610,7 @@ class SQLiteSessionStore:
                 return None
             return row["language"]
 
-        return self._with_db(_op)
+        return self._with_read(_op)
 
     def set_phase(self, session_id: str, phase: str) -> None:
         """Set conversation phase."""
@@ -328,9 +620,8 @@ class SQLiteSessionStore:
                 "UPDATE sessions SET phase = ? WHERE session_id = ?",
                 (phase, session_id),
             )
-            conn.commit()
 
-        self._with_db(_op)
+        self._with_write(_op)
 
     def get_gemini_live_session_id(self, session_id: str) -> Optional[str]:
         """Get Gemini Live session id bound to Speak2Fill session."""
@@ -344,7 +635,7 @@ class SQLiteSessionStore:
                 return None
             return row["gemini_live_session_id"]
 
-        return self._with_db(_op)
+        return self._with_read(_op)
 
     def set_gemini_live_session_id(self, session_id: str, live_session_id: str) -> None:
         """Bind Gemini Live session id to Speak2Fill session."""
@@ -354,9 +645,8 @@ class SQLiteSessionStore:
                 "UPDATE sessions SET gemini_live_session_id = ? WHERE session_id = ?",
                 (live_session_id, session_id),
             )
-            conn.commit()
 
-        self._with_db(_op)
+        self._with_write(_op)
 
     def log_message(self, session_id: str, role: str, content: str) -> None:
         """Persist a chat message for auditing (role: 'user' | 'assistant' | 'system')."""
@@ -368,9 +658,37 @@ class SQLiteSessionStore:
                 "INSERT INTO messages(session_id, ts, role, content) VALUES (?, ?, ?, ?)",
                 (session_id, ts, role, content),
             )
-            conn.commit()
 
-        self._with_db(_op)
+        self._with_write(_op)
+
+
+class AsyncSessionStore:
+    """Awaitable view of a SQLiteSessionStore for async route handlers.
+
+    `await async_store.get_language(sid)` runs `store.get_language(sid)` in a
+    worker thread, so SQLite calls never block the event loop.
+    """
+
+    # Not meaningful across a thread hop: transaction() must stay on one
+    # thread, and lifecycle calls belong to the sync store.
+    _SYNC_ONLY = frozenset({"transaction", "close"})
+
+    def __init__(self, sync_store: SQLiteSessionStore):
+        self._store = sync_store
+
+    def __getattr__(self, name: str):
+        if name.startswith("_") or name in self._SYNC_ONLY:
+            raise AttributeError(name)
+        method = getattr(self._store, name)
+
+        async def _call(*args: Any, **kwargs: Any) -> Any:
+            return await asyncio.to_thread(method, *args, **kwargs)
+
+        _call.__name__ = name
+        _call.__doc__ = method.__doc__
+        return _call
 
 
 store = SQLiteSessionStore(_lock=threading.Lock())
+async_store = AsyncSessionStore(store)
+atexit.register(store.close)
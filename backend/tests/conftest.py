@@ -1,51 +1,164 @@
-import io
+import functools
+import os
 import sys
 from pathlib import Path
 
+import httpx
 import pytest
 from fastapi.testclient import TestClient
-from PIL import Image
 
 BACKEND_ROOT = Path(__file__).resolve().parents[1]
 if str(BACKEND_ROOT) not in sys.path:
     sys.path.insert(0, str(BACKEND_ROOT))
 
 
-@pytest.fixture()
-def app(tmp_path, monkeypatch):
-    # Ensure each test run uses an isolated DB file.
-    monkeypatch.setenv("SPEAK2FILL_DB_PATH", str(tmp_path / "test.db"))
+class _FakeResponse:
+    def __init__(self, payload):
+        self._payload = payload
+
+    def raise_for_status(self):
+        return None
+
+    def json(self):
+        return self._payload
+
+
+# Simulate nested PaddleOCR-VL style payload. Built once and shared: the
+# analyze route only reads it.
+_OCR_PAYLOAD = [
+    {
+        "res": {
+            "width": 300,
+            "height": 120,
+            "parsing_res_list": [
+                {
+                    "block_label": "text",
+                    "block_content": "Name",
+                    "block_bbox": [10, 10, 80, 30],
+                    "score": 0.99,
+                }
+            ],
+        }
+    }
+]
+_OCR_RESPONSE = _FakeResponse(_OCR_PAYLOAD)
+
+
+# 1x1 white RGB PNG. The analyze route only needs something Pillow can open;
+# the image size used in responses comes from the (mocked) OCR payload.
+_PNG_1X1 = (
+    b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x02"
+    b"\x00\x00\x00\x90wS\xde\x00\x00\x00\x0cIDATx\xdac\xf8\xff\xff?\x00\x05\xfe\x02"
+    b"\xfe3\x12\x95\x14\x00\x00\x00\x00IEND\xaeB`\x82"
+)
+
+# Named per pytest-xdist worker so parallel runs (`pytest -n auto`) never
+# share a database.
+_WORKER = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+
 
+@functools.lru_cache(maxsize=4)
+def _cached_create_app(db_path: str):
+    # Keyed by DB path: the app is otherwise identical for a fixed env.
     from app.main import create_app
 
     return create_app()
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
+def _init_schema(tmp_path_factory):
+    """Point the store at the test DB and create its schema, once per run."""
+    db_path = str(tmp_path_factory.mktemp(f"db-{_WORKER}") / "test.db")
+    mp = pytest.MonkeyPatch()
+    mp.setenv("SPEAK2FILL_DB_PATH", db_path)
+
+    from app.services.storage_service import store
+
+    # Opening the pool runs _init_db; later tests only clear rows.
+    store._get_pool()
+    yield db_path
+    store.close()
+    mp.undo()
+
+
+@pytest.fixture(scope="session")
+def app(_init_schema):
+    # One app and one DB file for the whole run; _clean_db empties the
+    # tables between tests instead of rebuilding the app.
+    return _cached_create_app(_init_schema)
+
+
+@pytest.fixture(scope="session")
 def client(app):
     return TestClient(app)
 
 
+@pytest.fixture(scope="session")
+def anyio_backend():
+    # Async tests run on asyncio through anyio's pytest plugin.
+    return "asyncio"
+
+
 @pytest.fixture()
-def sample_image_bytes() -> bytes:
-    """Generate a tiny in-memory PNG to use for multipart upload tests."""
-    img = Image.new("RGB", (300, 120), color=(255, 255, 255))
-    buf = io.BytesIO()
-    img.save(buf, format="PNG")
-    return buf.getvalue()
+async def aclient(app):
+    """Call the app in-process over ASGI, without TestClient's thread portal."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
 
 
 @pytest.fixture(autouse=True)
-def ocr_service_url(monkeypatch):
+def _clean_db(request):
+    """Give every test that uses the app an empty database."""
+    if "app" not in request.fixturenames:
+        return
+    request.getfixturevalue("app")
+
+    from app.services.storage_service import store
+
+    def _wipe(conn):
+        # Children first: foreign keys point at sessions.
+        conn.execute("DELETE FROM messages")
+        conn.execute("DELETE FROM session_images")
+        conn.execute("DELETE FROM sessions")
+
+    # Through the store's own writer, so it serializes with app writes.
+    store._with_write(_wipe)
+    store._clear_caches()
+
+
+@pytest.fixture(scope="session")
+def sample_image_bytes() -> bytes:
+    """A tiny valid PNG to use for multipart upload tests."""
+    return _PNG_1X1
+
+
+@pytest.fixture(scope="session")
+def sample_upload(sample_image_bytes):
+    """The /analyze-form multipart body for sample_image_bytes, encoded once.
+
+    Returns (body, headers); post with `content=body, headers=headers`.
+    """
+    request = httpx.Request(
+        "POST",
+        "http://test/analyze-form",
+        files={"file": ("form.png", sample_image_bytes, "image/png")},
+    )
+    return request.read(), {"content-type": request.headers["content-type"]}
+
+
+@pytest.fixture(scope="session", autouse=True)
+def ocr_service_url():
     """Provide a placeholder OCR endpoint for tests."""
 
-    monkeypatch.setenv("OCR_SERVICE_URL", "http://ocr.test.local")
-    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
-    return True
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("OCR_SERVICE_URL", "http://ocr.test.local")
+        mp.setenv("GEMINI_API_KEY", "test-key")
+        yield True
 
 
-@pytest.fixture(autouse=True)
-def mock_gemini(monkeypatch):
+@pytest.fixture(scope="session", autouse=True)
+def mock_gemini():
     """Stub Gemini field analysis to avoid network calls during tests."""
 
     from app.services import gemini_service
@@ -66,46 +179,29 @@ def mock_gemini(monkeypatch):
             }
         ]
 
-    monkeypatch.setattr(gemini_service.GeminiService, "analyze_form_fields", _fake_analyze)
-    return True
+    # Installed once for the run; nothing in the suite needs the real call.
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(gemini_service.GeminiService, "analyze_form_fields", _fake_analyze)
+        yield True
 
 
-@pytest.fixture()
-def mock_remote_ocr(monkeypatch):
-    """Mock remote OCR HTTP call so tests stay fast and offline."""
-
-    from app.routes import analyze as analyze_module
+@pytest.fixture(scope="session")
+def mock_remote_ocr():
+    """Mock remote OCR HTTP call so tests stay fast and offline.
 
-    class _FakeResponse:
-        def __init__(self, payload: dict):
-            self._payload = payload
+    Session-scoped: once a test requests it, the stub stays in place for the
+    rest of the run (no test relies on a real OCR call).
+    """
 
-        def raise_for_status(self):
-            return None
+    from app.routes import analyze as analyze_module
 
-        def json(self):
-            return self._payload
+    class _FakeSession:
+        def post(self, url, **kwargs):
+            _ = url, kwargs
+            return _OCR_RESPONSE
 
-    def _fake_post(url, **kwargs):
-        _ = url, kwargs
-        # Simulate nested PaddleOCR-VL style payload
-        payload = [
-            {
-                "res": {
-                    "width": 300,
-                    "height": 120,
-                    "parsing_res_list": [
-                        {
-                            "block_label": "text",
-                            "block_content": "Name",
-                            "block_bbox": [10, 10, 80, 30],
-                            "score": 0.99,
-                        }
-                    ],
-                }
-            }
-        ]
-        return _FakeResponse(payload)
+    fake_session = _FakeSession()
 
-    monkeypatch.setattr(analyze_module.requests, "post", _fake_post)
-    return True
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(analyze_module, "_ocr_session", lambda: fake_session)
+        yield True
@@ -1,18 +1,24 @@
+from io import BytesIO
+
 import pytest
+from PIL import Image
+
+pytestmark = pytest.mark.anyio
 
 
-def test_analyze_form_rejects_non_image(client):
-    resp = client.post(
+async def test_analyze_form_rejects_non_image(aclient):
+    resp = await aclient.post(
         "/analyze-form",
         files={"file": ("x.txt", b"hello", "text/plain")},
     )
     assert resp.status_code == 400
 
 
-def test_analyze_form_creates_session_and_fields(client, sample_image_bytes, mock_remote_ocr):
-    resp = client.post(
+async def test_analyze_form_creates_session_and_fields(aclient, sample_upload, mock_remote_ocr):
+    resp = await aclient.post(
         "/analyze-form",
-        files={"file": ("form.png", sample_image_bytes, "image/png")},
+        content=sample_upload[0],
+        headers=sample_upload[1],
     )
     assert resp.status_code == 200
 
@@ -45,3 +51,34 @@ def test_analyze_form_creates_session_and_fields(client, sample_image_bytes, moc
     assert "text" not in first_field  # text is runtime state, not analysis-time
     assert isinstance(first_field["bbox"], list)
     assert len(first_field["bbox"]) == 4
+
+
+async def test_analyze_form_rejects_truncated_image(aclient, sample_image_bytes):
+    resp = await aclient.post(
+        "/analyze-form",
+        files={"file": ("form.png", sample_image_bytes[:60], "image/png")},
+    )
+    assert resp.status_code == 400
+
+
+async def test_analyze_form_rejects_truncated_jpeg(aclient):
+    buf = BytesIO()
+    Image.effect_noise((640, 480), 64).convert("RGB").save(buf, format="JPEG")
+    truncated = buf.getvalue()[: len(buf.getvalue()) // 2]
+
+    resp = await aclient.post(
+        "/analyze-form",
+        files={"file": ("photo.jpg", truncated, "image/jpeg")},
+    )
+    assert resp.status_code == 400
+
+
+async def test_analyze_form_accepts_jpeg(aclient, mock_remote_ocr):
+    buf = BytesIO()
+    Image.new("RGB", (640, 480), color=(255, 255, 255)).save(buf, format="JPEG")
+
+    resp = await aclient.post(
+        "/analyze-form",
+        files={"file": ("photo.jpg", buf.getvalue(), "image/jpeg")},
+    )
+    assert resp.status_code == 200
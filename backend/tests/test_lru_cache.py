@@ -0,0 +1,49 @@
+"""Tests for the in-process LRU cache."""
+from app.services.lru_cache import LRUCache
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_lru_cache_expires_entries_after_ttl():
+    now = [1000.0]
+
+    cache = LRUCache(maxsize=4, ttl=10, timer=lambda: now[0])
+    cache.set("k", "v")
+    now[0] += 9
+    assert cache.get("k") == "v"
+    now[0] += 2
+    assert cache.get("k") is None
+    assert len(cache) == 0
+
+
+def test_lru_cache_refresh_on_get_slides_expiry():
+    now = [1000.0]
+
+    cache = LRUCache(maxsize=4, ttl=10, refresh_on_get=True, timer=lambda: now[0])
+    cache.set("k", "v")
+    for _ in range(3):
+        now[0] += 9
+        assert cache.get("k") == "v"
+    now[0] += 11
+    assert cache.get("k") is None
+
+
+def test_lru_cache_pop_and_clear():
+    cache = LRUCache(maxsize=4)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.pop("a") == 1
+    assert cache.pop("a", "missing") == "missing"
+    cache.clear()
+    assert cache.get("b") is None
@@ -0,0 +1,63 @@
+"""Tests for SarvamService response caching."""
+import base64
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import sarvam_service
+from app.services.sarvam_service import SarvamService
+
+pytestmark = pytest.mark.anyio
+
+
+class _FakeTTS:
+    def __init__(self):
+        self.calls = 0
+
+    def convert(self, **kwargs):
+        self.calls += 1
+        return SimpleNamespace(audios=[base64.b64encode(b"audio").decode()])
+
+
+def _service_with_fake_client(tts: _FakeTTS) -> SarvamService:
+    service = SarvamService()
+    service.stub = False
+    service.client = SimpleNamespace(text_to_speech=tts)
+    return service
+
+
+async def test_text_to_speech_reuses_cached_audio(monkeypatch):
+    monkeypatch.setattr(sarvam_service, "_tts_cache", sarvam_service.LRUCache(maxsize=8))
+    tts = _FakeTTS()
+
+    first = await _service_with_fake_client(tts).text_to_speech("Hello", "en-IN", "anushka")
+    # A separately constructed service shares the module-level cache.
+    second = await _service_with_fake_client(tts).text_to_speech("Hello", "en-IN", "anushka")
+    await _service_with_fake_client(tts).text_to_speech("Hello", "hi-IN", "anushka")
+
+    assert first == second == b"audio"
+    assert tts.calls == 2
+
+
+class _FakeSTT:
+    def __init__(self):
+        self.calls = 0
+
+    def transcribe(self, **kwargs):
+        self.calls += 1
+        return SimpleNamespace(transcript="ravi kumar", language_code="en-IN")
+
+
+async def test_speech_to_text_reuses_cached_transcript(monkeypatch):
+    monkeypatch.setattr(sarvam_service, "_stt_cache", sarvam_service.LRUCache(maxsize=8))
+    stt = _FakeSTT()
+    service = SarvamService()
+    service.stub = False
+    service.client = SimpleNamespace(speech_to_text=stt)
+
+    first = await service.speech_to_text(b"RIFF-audio", language_code="unknown")
+    second = await service.speech_to_text(b"RIFF-audio", language_code="unknown")
+    await service.speech_to_text(b"RIFF-other", language_code="unknown")
+
+    assert first == second == ("ravi kumar", "en-IN")
+    assert stt.calls == 2
@@ -1,9 +1,10 @@
-def test_get_session_returns_full_response(client, sample_image_bytes, mock_remote_ocr):
+def test_get_session_returns_full_response(client, sample_upload, mock_remote_ocr):
     """Test that we can retrieve the full analyze-form response by session_id."""
     # Create a session first
     resp = client.post(
         "/analyze-form",
-        files={"file": ("form.png", sample_image_bytes, "image/png")},
+        content=sample_upload[0],
+        headers=sample_upload[1],
     )
     assert resp.status_code == 200
     session_id = resp.json()["session_id"]
@@ -21,12 +22,13 @@ def test_get_session_returns_full_response(client, sample_image_bytes, mock_remo
     assert len(body["fields"]) >= 1
 
 
-def test_get_session_image_returns_image(client, sample_image_bytes, mock_remote_ocr):
+def test_get_session_image_returns_image(client, sample_upload, mock_remote_ocr):
     """Test that we can retrieve the original uploaded image by session_id."""
     # Create a session first
     resp = client.post(
         "/analyze-form",
-        files={"file": ("form.png", sample_image_bytes, "image/png")},
+        content=sample_upload[0],
+        headers=sample_upload[1],
     )
     assert resp.status_code == 200
     session_id = resp.json()["session_id"]
@@ -0,0 +1,277 @@
+"""Tests for the SQLite session store."""
+import json
+import sqlite3
+import threading
+
+import pytest
+
+from app.schemas.models import FormField
+from app.services.storage_service import AsyncSessionStore, SQLiteSessionStore
+
+
+@pytest.fixture()
+def db_store(tmp_path, monkeypatch):
+    monkeypatch.setenv("SPEAK2FILL_DB_PATH", str(tmp_path / "store.db"))
+    s = SQLiteSessionStore(_lock=threading.Lock())
+    yield s
+    s.close()
+
+
+def _fields():
+    return [
+        FormField(field_id="name_0", label="Name", bbox=[10, 10, 80, 30]),
+        FormField(field_id="dob_1", label="DOB", bbox=[10, 40, 80, 60]),
+    ]
+
+
+def test_store_reads_see_committed_writes(db_store):
+    session_id = db_store.create_session(
+        filename="form.png",
+        ocr_items=[{"text": "Name", "bbox": [10, 10, 80, 30], "score": 0.99}],
+        fields=_fields(),
+        image_width=300,
+        image_height=120,
+        image_data=b"\x89PNG",
+    )
+
+    session = db_store.get_session(session_id)
+    assert session["filename"] == "form.png"
+    assert [f["field_id"] for f in session["fields"]] == ["name_0", "dob_1"]
+    assert db_store.get_image(session_id) == b"\x89PNG"
+
+    db_store.set_field_value(session_id, "name_0", "Ravi")
+    db_store.set_phase(session_id, "AWAIT_CONFIRMATION")
+    db_store.advance_field_index(session_id)
+    assert db_store.get_field_value(session_id, "name_0") == "Ravi"
+    assert db_store.get_phase(session_id) == "AWAIT_CONFIRMATION"
+    assert db_store.get_current_field_index(session_id) == 1
+
+
+def test_store_reopens_pool_when_db_path_changes(db_store, tmp_path, monkeypatch):
+    session_id = db_store.create_session("a.png", [], _fields())
+    first_pool = db_store._pool
+
+    monkeypatch.setenv("SPEAK2FILL_DB_PATH", str(tmp_path / "other.db"))
+    assert db_store.get_session(session_id) is None
+    assert db_store._pool is not first_pool
+
+
+def test_store_handles_concurrent_readers(db_store):
+    session_id = db_store.create_session("a.png", [], _fields())
+    errors = []
+
+    def _read():
+        try:
+            for _ in range(20):
+                assert db_store.get_session(session_id)["session_id"] == session_id
+        except Exception as exc:  # pragma: no cover - surfaced below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=_read) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+
+
+def test_store_migrates_legacy_sessions_table(tmp_path, monkeypatch):
+    path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE sessions (session_id TEXT PRIMARY KEY, created_at REAL NOT NULL, "
+        "filename TEXT NOT NULL, ocr_items_json TEXT NOT NULL, fields_json TEXT NOT NULL, "
+        "current_field_index INTEGER NOT NULL DEFAULT 0, filled_fields_json TEXT NOT NULL DEFAULT '{}', "
+        "language TEXT NOT NULL DEFAULT 'en', image_width INTEGER NOT NULL DEFAULT 0, "
+        "image_height INTEGER NOT NULL DEFAULT 0)"
+    )
+    conn.execute(
+        "INSERT INTO sessions(session_id, created_at, filename, ocr_items_json, fields_json) "
+        "VALUES ('old', 0, 'old.png', '[{\"text\":\"Name\"}]', '[]')"
+    )
+    conn.commit()
+    conn.close()
+
+    monkeypatch.setenv("SPEAK2FILL_DB_PATH", str(path))
+    s = SQLiteSessionStore(_lock=threading.Lock())
+    try:
+        assert s.get_phase("old") == "COLLECT_DATA"
+        assert s.get_gemini_live_session_id("old") is None
+        assert s.get_image("old") is None
+        assert s.get_session("old")["ocr_items"] == [{"text": "Name"}]
+    finally:
+        s.close()
+
+
+def test_store_set_field_value_updates_json_in_place(db_store):
+    session_id = db_store.create_session("a.png", [], _fields())
+    db_store.set_field_value(session_id, "name_0", "Ravi")
+    db_store.set_field_value(session_id, "dob_1", "01/02/1990")
+    db_store.set_field_value(session_id, "name_0", "Ravi Kumar")
+
+    assert db_store.get_field_value(session_id, "name_0") == "Ravi Kumar"
+    assert db_store.get_field_value(session_id, "dob_1") == "01/02/1990"
+    assert db_store.get_field_value(session_id, "missing") is None
+    # Unknown sessions are a no-op, as before.
+    db_store.set_field_value("does-not-exist", "name_0", "x")
+    with pytest.raises(ValueError):
+        db_store.set_field_value(session_id, 'bad"id', "x")
+    for bad in ("a\\b", "a\tb"):
+        with pytest.raises(ValueError):
+            db_store.set_field_value(session_id, bad, "x")
+        assert db_store.get_field_value(session_id, bad) is None
+    # Other punctuation and non-ASCII keys round-trip.
+    for key in ("a.b", "a b", "नाम", "x[0]"):
+        db_store.set_field_value(session_id, key, key)
+        assert db_store.get_field_value(session_id, key) == key
+
+
+def test_store_moves_inline_images_to_session_images(tmp_path, monkeypatch):
+    path = tmp_path / "inline.db"
+    monkeypatch.setenv("SPEAK2FILL_DB_PATH", str(path))
+    s = SQLiteSessionStore(_lock=threading.Lock())
+    session_id = s.create_session("a.png", [], _fields())
+    s.close()
+
+    # Simulate a row written by a version that kept the image inline.
+    conn = sqlite3.connect(path)
+    conn.execute("UPDATE sessions SET image_data = ? WHERE session_id = ?", (b"inline", session_id))
+    conn.commit()
+    conn.close()
+
+    s = SQLiteSessionStore(_lock=threading.Lock())
+    try:
+        assert s.get_image(session_id) == b"inline"
+    finally:
+        s.close()
+    conn = sqlite3.connect(path)
+    assert conn.execute("SELECT COUNT(*) FROM sessions WHERE image_data IS NOT NULL").fetchone()[0] == 0
+    conn.close()
+
+
+def test_store_full_response_is_cached_per_session(db_store):
+    session_id = db_store.create_session("a.png", [], _fields(), image_width=300, image_height=120)
+    first = db_store.get_full_response(session_id)
+    assert first["image_width"] == 300
+
+    # Callers get their own dict, so mutating it doesn't leak into the cache.
+    first["image_width"] = 0
+    assert db_store.get_full_response(session_id)["image_width"] == 300
+
+
+def test_store_get_session_reflects_state_changes(db_store):
+    session_id = db_store.create_session("a.png", [], _fields())
+    assert db_store.get_session(session_id)["phase"] == "COLLECT_DATA"
+
+    db_store.set_phase(session_id, "AWAIT_CONFIRMATION")
+    db_store.set_language(session_id, "ml")
+    session = db_store.get_session(session_id)
+    assert session["phase"] == "AWAIT_CONFIRMATION"
+    assert session["language"] == "ml"
+
+
+def test_store_transaction_commits_or_rolls_back_as_a_batch(db_store):
+    with db_store.transaction():
+        session_id = db_store.create_session("a.png", [], _fields())
+        db_store.set_field_value(session_id, "name_0", "Ravi")
+        db_store.log_message(session_id, "assistant", "What is your name?")
+        db_store.set_phase(session_id, "AWAIT_CONFIRMATION")
+        # Reads inside the block see its own uncommitted writes.
+        assert db_store.get_field_value(session_id, "name_0") == "Ravi"
+        assert db_store.get_phase(session_id) == "AWAIT_CONFIRMATION"
+        assert db_store.get_session(session_id)["phase"] == "AWAIT_CONFIRMATION"
+    assert db_store.get_field_value(session_id, "name_0") == "Ravi"
+    assert db_store.get_session(session_id)["phase"] == "AWAIT_CONFIRMATION"
+
+    with pytest.raises(RuntimeError):
+        with db_store.transaction():
+            db_store.set_field_value(session_id, "name_0", "Someone else")
+            with db_store.transaction():
+                db_store.advance_field_index(session_id)
+            assert db_store.get_full_response(session_id) is not None
+            raise RuntimeError("boom")
+    assert db_store.get_field_value(session_id, "name_0") == "Ravi"
+    assert db_store.get_current_field_index(session_id) == 0
+
+
+def _read_in_other_thread(fn, *args):
+    seen = []
+    other = threading.Thread(target=lambda: seen.append(fn(*args)))
+    other.start()
+    other.join(5)
+    return seen[0]
+
+
+def test_store_transaction_writes_are_invisible_to_other_threads(db_store):
+    with db_store.transaction():
+        session_id = db_store.create_session("a.png", [], _fields())
+        assert _read_in_other_thread(db_store.get_session, session_id) is None
+    assert db_store.get_session(session_id) is not None
+
+
+def test_store_transaction_reads_do_not_leak_through_response_cache(db_store):
+    with pytest.raises(RuntimeError):
+        with db_store.transaction():
+            session_id = db_store.create_session("a.png", [], _fields())
+            # The owning thread sees its row...
+            assert db_store.get_full_response(session_id)["session_id"] == session_id
+            # ...but that uncommitted read must not reach other threads.
+            assert _read_in_other_thread(db_store.get_full_response, session_id) is None
+            raise RuntimeError("rollback")
+    assert _read_in_other_thread(db_store.get_full_response, session_id) is None
+    assert db_store.get_full_response(session_id) is None
+
+
+def test_store_close_waits_for_in_flight_reads(db_store):
+    session_id = db_store.create_session("a.png", [], _fields())
+    reading = threading.Event()
+    release = threading.Event()
+    results = []
+
+    def _slow_read(conn):
+        reading.set()
+        release.wait(5)
+        return conn.execute("SELECT filename FROM sessions WHERE session_id = ?", (session_id,)).fetchone()[0]
+
+    reader = threading.Thread(target=lambda: results.append(db_store._with_read(_slow_read)))
+    reader.start()
+    assert reading.wait(5)
+
+    closer = threading.Thread(target=db_store.close)
+    closer.start()
+    closer.join(0.2)
+    assert closer.is_alive()  # blocked until the read finishes
+
+    release.set()
+    reader.join(5)
+    closer.join(5)
+    assert results == ["a.png"]
+    assert db_store._pool is None
+
+
+@pytest.mark.anyio
+async def test_async_store_runs_store_methods_off_the_event_loop(db_store):
+    async_store = AsyncSessionStore(db_store)
+
+    session_id = await async_store.create_session("a.png", [], _fields())
+    await async_store.set_language(session_id, "ml")
+    assert await async_store.get_language(session_id) == "ml"
+    assert db_store.get_session(session_id)["language"] == "ml"
+    with pytest.raises(AttributeError):
+        async_store.transaction
+
+
+def test_store_keeps_ocr_items_compressed(db_store, tmp_path):
+    items = [{"text": f"Field {i}", "bbox": [i, i, i + 50, i + 20], "score": 0.9} for i in range(50)]
+    session_id = db_store.create_session("a.png", items, _fields())
+
+    conn = sqlite3.connect(tmp_path / "store.db")
+    raw_json, blob = conn.execute(
+        "SELECT ocr_items_json, ocr_items_zlib FROM sessions WHERE session_id = ?", (session_id,)
+    ).fetchone()
+    conn.close()
+    assert raw_json == ""
+    assert len(blob) < len(json.dumps(items)) // 3
+
+    assert db_store.get_session(session_id)["ocr_items"] == items
+    assert db_store.get_full_response(session_id)["ocr_items"] == items